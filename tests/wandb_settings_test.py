@@ -9,6 +9,7 @@ from wandb import Settings
 from wandb.errors import UsageError
 import os
 import copy
+import datetime
 from wandb.sdk import wandb_settings
 
 
@@ -36,6 +37,14 @@ def test_attrib_set_bad():
         s.missing = "nope"
 
 
+def test_getitem_property():
+    s = Settings(mode="offline")
+    assert s["_offline"] is True
+    assert s["mode"] == "offline"
+    assert "_offline" in s.keys()
+    assert dict(s)["_offline"] is True
+
+
 def test_update_dict():
     s = Settings()
     s.update(dict(base_url="something2"))
@@ -107,6 +116,18 @@ def test_copy():
     assert s2.base_url == "changed"
 
 
+def test_copy_keeps_sources():
+    s = Settings()
+    s.update(project="pizza", _source=s.Source.PROJECT)
+    s.update(entity="team", _source=s.Source.ENTITY)
+    s2 = copy.copy(s)
+    assert s2.project == "pizza"
+    assert s2.entity == "team"
+    s2.update(project="pizza2", entity="team2", _source=s.Source.ENTITY)
+    assert s2.project == "pizza"
+    assert s2.entity == "team2"
+
+
 def test_invalid_dict():
     s = Settings()
     with pytest.raises(KeyError):
@@ -155,6 +176,45 @@ def test_bad_choice():
         s.update(mode="badpro")
 
 
+def test_bad_bool_string():
+    s = Settings()
+    s.update(silent="true", show_errors="False")
+    assert s._silent is True
+    assert s._show_errors is False
+    for key in ("strict", "silent", "show_info", "show_warnings", "show_errors"):
+        with pytest.raises(UsageError, match="is not a boolean"):
+            s.update({key: "maybe"})
+
+
+def test_validate_project():
+    s = Settings()
+    s.update(project="good-project_1")
+    assert s.project == "good-project_1"
+    with pytest.raises(UsageError, match='found "#"'):
+        s.update(project="bad#project")
+    with pytest.raises(UsageError, match="exceeded 128 characters"):
+        s.update(project="p" * 129)
+    assert s.project == "good-project_1"
+
+
+def test_bad_start_method():
+    s = Settings()
+    s.update(start_method="thread")
+    assert s.start_method == "thread"
+    with pytest.raises(UsageError):
+        s.update(start_method="badmethod")
+
+
+def test_update_same_value_keeps_priority():
+    s = Settings()
+    s.update(mode="offline", _source=s.Source.ENTITY)
+    s.update(mode="offline", _source=s.Source.PROJECT)
+    s.update(mode="online", _source=s.Source.ENTITY)
+    assert s.mode == "offline"
+    with pytest.raises(UsageError):
+        s.update(mode="bad")
+
+
 def test_prio_update_ok():
     s = Settings()
     s.update(project="pizza", _source=s.Source.ENTITY)
@@ -266,6 +326,52 @@ def test_preprocess_base_url():
     assert s.base_url == "//http://host.com"
 
 
+def test_path_convert_follows_run_settings():
+    s = Settings(
+        mode="offline",
+        run_id="abc123",
+        _start_time=1609556645.0,
+        _start_datetime=datetime.datetime(2021, 1, 2, 3, 4, 5),
+    )
+    files_dir = s.files_dir
+    assert os.path.basename(os.path.dirname(files_dir)) == (
+        "offline-run-20210102_030405-abc123"
+    )
+    s.update(run_id="def456", mode="online")
+    assert s.files_dir != files_dir
+    assert os.path.basename(os.path.dirname(s.files_dir)) == (
+        "run-20210102_030405-def456"
+    )
+
+
+def test_start_run():
+    s = Settings()
+    assert s._start_time is None
+    assert s._start_datetime is None
+    s._start_run()
+    assert isinstance(s._start_time, float)
+    assert isinstance(s._start_datetime, datetime.datetime)
+    assert not [k for k in s.keys() if k.startswith("_Settings")]
+
+
+def test_derived_deps_are_settings():
+    s = Settings()
+    for deps in wandb_settings._derived_deps.values():
+        for key in deps:
+            assert key in s.__dict__
+
+
+def test_is_local():
+    s = Settings()
+    assert not s.is_local
+    s.update(base_url="https://api.wandb.ai/")
+    assert not s.is_local
+    s.update(base_url="http://localhost:8080")
+    assert s.is_local
+    s.base_url = "https://api.wandb.ai"
+    assert not s.is_local
+
+
 def test_code_saving_save_code_env_false(live_mock_server, test_settings):
     test_settings.update({"save_code": None})
     os.environ["WANDB_SAVE_CODE"] = "false"
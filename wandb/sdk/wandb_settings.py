@@ -26,6 +26,7 @@ import copy
 from datetime import datetime
 from distutils.util import strtobool
 import enum
+import functools
 import getpass
 import itertools
 import json
@@ -53,6 +54,7 @@ from typing import (
     Tuple,
     Type,
     TYPE_CHECKING,
+    TypeVar,
     Union,
 )
 
@@ -69,6 +71,7 @@ from .lib.runid import generate_id
 
 
 Defaults = Dict[str, Union[str, int, bool, Tuple]]
+_T = TypeVar("_T")
 
 defaults: Defaults = dict(
     base_url="https://api.wandb.ai",
@@ -126,6 +129,27 @@ env_convert: Dict[str, Callable[[str], List[str]]] = dict(
     run_tags=lambda s: s.split(","), ignore_globs=lambda s: s.split(",")
 )
 
+_mode_choices: FrozenSet[str] = frozenset(
+    {"dryrun", "run", "offline", "online", "disabled"}
+)
+# {"auto", "redirect", "off", "file", "iowrap", "notebook"}
+_console_choices: FrozenSet[str] = frozenset({"auto", "redirect", "off", "wrap"})
+_problem_choices: FrozenSet[str] = frozenset({"fatal", "warn", "silent"})
+_anonymous_choices: FrozenSet[str] = frozenset(
+    {"allow", "must", "never", "false", "true"}
+)
+
+# settings keys read by each cached derived value, the cached value is reused
+# only while all of these are unchanged
+_derived_deps: Dict[str, Tuple[str, ...]] = dict(
+    run_format=("_start_time", "_start_datetime", "run_id", "mode", "disabled"),
+)
+
+_project_invalid_chars: str = "/\\#?%:"
+_project_invalid_chars_table: Dict[int, Optional[int]] = str.maketrans(
+    "", "", _project_invalid_chars
+)
+
 
 def _build_inverse_map(prefix: str, d: Dict[str, Optional[str]]) -> Dict[str, str]:
     inv_map = dict()
@@ -135,10 +159,22 @@ def _build_inverse_map(prefix: str, d: Dict[str, Optional[str]]) -> Dict[str, st
     return inv_map
 
 
-def _error_choices(value: str, choices: Set[str]) -> str:
+# environment variable name -> setting key, fixed once env_settings is defined
+_env_inverse_map: Dict[str, str] = _build_inverse_map(env_prefix, env_settings)
+
+
+def _error_choices(value: str, choices: Union[Set[str], FrozenSet[str]]) -> str:
     return "{} not in [{}]".format(value, ", ".join(list(choices)))
 
 
+@functools.lru_cache(maxsize=1)
+def _available_start_methods() -> FrozenSet[str]:
+    available_methods = ["thread"]
+    if hasattr(multiprocessing, "get_all_start_methods"):
+        available_methods += multiprocessing.get_all_start_methods()
+    return frozenset(available_methods)
+
+
 def _get_program() -> Optional[Any]:
     program = os.getenv(wandb.env.PROGRAM)
     if program:
@@ -224,6 +260,13 @@ class SettingsConsole(enum.Enum):
     REDIRECT = 2
 
 
+_console_convert: Dict[str, SettingsConsole] = dict(
+    off=SettingsConsole.OFF,
+    wrap=SettingsConsole.WRAP,
+    redirect=SettingsConsole.REDIRECT,
+)
+
+
 class Settings(object):
     """Settings Constructor
 
@@ -304,8 +347,7 @@ class Settings(object):
     __frozen: bool
     __defaults_dict: Dict[str, int]
     __override_dict: Dict[str, int]
-    __defaults_dict_set: Dict[str, Set[int]]
-    __override_dict_set: Dict[str, Set[int]]
+    __derived_cache: Dict[str, Tuple[Tuple[Any, ...], Any]]
 
     @enum.unique
     class Source(enum.IntEnum):
@@ -323,6 +365,9 @@ class Settings(object):
         SETTINGS: int = 12
         ARGS: int = 13
 
+    # enum member lookup is slow compared to a plain class attribute
+    _setup_source: int = Source.SETUP.value
+
     Console: Type[SettingsConsole] = SettingsConsole
 
     def __init__(  # pylint: disable=unused-argument
@@ -440,16 +485,15 @@ class Settings(object):
     ):
         kwargs = dict(locals())
         kwargs.pop("self")
+        # write __dict__ directly, __setattr__ would route through _update
+        instance_dict = self.__dict__
         # Set up entries for all possible parameters
-        self.__dict__.update({k: None for k in kwargs})
+        instance_dict.update(dict.fromkeys(kwargs))
         # setup private attributes
-        object.__setattr__(self, "_Settings__frozen", False)
-        object.__setattr__(self, "_Settings__defaults_dict", dict())
-        object.__setattr__(self, "_Settings__override_dict", dict())
-        object.__setattr__(self, "_Settings__defaults_dict_set", dict())
-        object.__setattr__(self, "_Settings__override_dict_set", dict())
-        object.__setattr__(self, "_Settings_start_datetime", None)
-        object.__setattr__(self, "_Settings_start_time", None)
+        instance_dict["_Settings__frozen"] = False
+        instance_dict["_Settings__defaults_dict"] = dict()
+        instance_dict["_Settings__override_dict"] = dict()
+        instance_dict["_Settings__derived_cache"] = dict()
         class_defaults = self._get_class_defaults()
         self._apply_defaults(class_defaults)
         self._apply_defaults(defaults)
@@ -525,11 +569,6 @@ class Settings(object):
 
     @property
     def _console(self) -> SettingsConsole:
-        convert_dict: Dict[str, SettingsConsole] = dict(
-            off=SettingsConsole.OFF,
-            wrap=SettingsConsole.WRAP,
-            redirect=SettingsConsole.REDIRECT,
-        )
         console: str = self.console
         if console == "auto":
             if self._jupyter:
@@ -563,7 +602,7 @@ class Settings(object):
                 #     console = "redirect"
             else:
                 console = "redirect"
-        convert: SettingsConsole = convert_dict[console]
+        convert: SettingsConsole = _console_convert[console]
         return convert
 
     @property
@@ -630,82 +669,58 @@ class Settings(object):
 
     @property
     def is_local(self) -> bool:
-        if self.base_url is not None:
-            return self.base_url.rstrip("/") != "https://api.wandb.ai"
+        base_url = self.base_url
+        if base_url is not None:
+            return base_url.rstrip("/") != "https://api.wandb.ai"
         return False
 
     def _validate_project(self, value: Optional[str]) -> Optional[str]:
-        invalid_chars_list = list("/\\#?%:")
         if value is not None:
             if len(value) > 128:
                 return f'Invalid project name "{value}", exceeded 128 characters'
-            invalid_chars = set([char for char in invalid_chars_list if char in value])
-            if invalid_chars:
-                return f"Invalid project name \"{value}\", cannot contain characters \"{','.join(invalid_chars_list)}\", found \"{','.join(invalid_chars)}\""
+            # translate strips the invalid chars in a single pass
+            if len(value.translate(_project_invalid_chars_table)) != len(value):
+                invalid_chars = set(_project_invalid_chars).intersection(value)
+                return f"Invalid project name \"{value}\", cannot contain characters \"{','.join(_project_invalid_chars)}\", found \"{','.join(invalid_chars)}\""
         return None
 
     def _validate_start_method(self, value: str) -> Optional[str]:
-        available_methods = ["thread"]
-        if hasattr(multiprocessing, "get_all_start_methods"):
-            available_methods += multiprocessing.get_all_start_methods()
+        available_methods = _available_start_methods()
         if value in available_methods:
             return None
-        return _error_choices(value, set(available_methods))
+        return _error_choices(value, available_methods)
 
     def _validate_mode(self, value: str) -> Optional[str]:
-        choices = {"dryrun", "run", "offline", "online", "disabled"}
-        if value in choices:
+        if value in _mode_choices:
             return None
-        return _error_choices(value, choices)
+        return _error_choices(value, _mode_choices)
 
     def _validate_console(self, value: str) -> Optional[str]:
-        # choices = {"auto", "redirect", "off", "file", "iowrap", "notebook"}
-        choices = {"auto", "redirect", "off", "wrap"}
-        if value in choices:
+        if value in _console_choices:
             return None
-        return _error_choices(value, choices)
+        return _error_choices(value, _console_choices)
 
     def _validate_problem(self, value: str) -> Optional[str]:
-        choices = {"fatal", "warn", "silent"}
-        if value in choices:
+        if value in _problem_choices:
             return None
-        return _error_choices(value, choices)
+        return _error_choices(value, _problem_choices)
 
     def _validate_anonymous(self, value: str) -> Optional[str]:
-        choices = {"allow", "must", "never", "false", "true"}
-        if value in choices:
+        if value in _anonymous_choices:
             return None
-        return _error_choices(value, choices)
+        return _error_choices(value, _anonymous_choices)
 
-    def _validate_strict(self, value: str) -> Optional[str]:
+    def _bool_validator(self, value: str) -> Optional[str]:
         val = _str_as_bool(value)
         if val is None:
             return "{} is not a boolean".format(value)
         return None
 
-    def _validate_silent(self, value: str) -> Optional[str]:
-        val = _str_as_bool(value)
-        if val is None:
-            return "{} is not a boolean".format(value)
-        return None
-
-    def _validate_show_info(self, value: str) -> Optional[str]:
-        val = _str_as_bool(value)
-        if val is None:
-            return "{} is not a boolean".format(value)
-        return None
-
-    def _validate_show_warnings(self, value: str) -> Optional[str]:
-        val = _str_as_bool(value)
-        if val is None:
-            return "{} is not a boolean".format(value)
-        return None
-
-    def _validate_show_errors(self, value: str) -> Optional[str]:
-        val = _str_as_bool(value)
-        if val is None:
-            return "{} is not a boolean".format(value)
-        return None
+    _validate_strict = _bool_validator
+    _validate_silent = _bool_validator
+    _validate_show_info = _bool_validator
+    _validate_show_warnings = _bool_validator
+    _validate_show_errors = _bool_validator
 
     def _validate_base_url(self, value: Optional[str]) -> Optional[str]:
         if value is not None:
@@ -743,16 +758,18 @@ class Settings(object):
     def _start_run(self) -> None:
         datetime_now: datetime = datetime.now()
         time_now: float = time.time()
-        object.__setattr__(self, "_Settings_start_datetime", datetime_now)
-        object.__setattr__(self, "_Settings_start_time", time_now)
+        self.update(_start_datetime=datetime_now, _start_time=time_now)
 
     def _apply_settings(
         self, settings: "Settings", _logger: Optional[_EarlyLogger] = None
     ) -> None:
-        # TODO(jhr): make a more efficient version of this
+        # batch keys by source so each source is applied with a single update
+        source_dicts: Dict[Optional[int], Dict[str, Any]] = dict()
         for k in settings._public_keys():
             source = settings.__defaults_dict.get(k)
-            self._update({k: settings[k]}, _source=source)
+            source_dicts.setdefault(source, dict())[k] = settings[k]
+        for source, d in source_dicts.items():
+            self._update(d, _source=source)
 
     def _apply_defaults(self, defaults: Defaults) -> None:
         self._update(defaults, _source=self.Source.BASE)
@@ -769,7 +786,7 @@ class Settings(object):
     def _apply_environ(
         self, environ: os._Environ, _logger: Optional[_EarlyLogger] = None
     ) -> None:
-        inv_map = _build_inverse_map(env_prefix, env_settings)
+        inv_map = _env_inverse_map
         env_dict = dict()
         for k, v in six.iteritems(environ):
             if not k.startswith(env_prefix):
@@ -827,17 +844,38 @@ class Settings(object):
                 return None
         return path_parts
 
-    def _path_convert(self, *path: Any) -> Optional[str]:
-        """convert slashes, expand ~ and other macros."""
+    def _cached_derived(self, name: str, compute: Callable[[], _T]) -> _T:
+        """return the cached derived value `name`, recomputing it when any of
+        the settings listed for it in _derived_deps has changed."""
+
+        instance_dict = self.__dict__
+        key = tuple(instance_dict[k] for k in _derived_deps[name])
+        cached = self.__derived_cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cast(_T, cached[1])
+        value = compute()
+        self.__derived_cache[name] = (key, value)
+        return value
 
-        format_dict: Dict[str, Union[str, int]] = dict()
+    def _run_format_dict(self) -> Dict[str, str]:
+        """macros naming the run directory."""
+        return self._cached_derived("run_format", self._build_run_format_dict)
+
+    def _build_run_format_dict(self) -> Dict[str, str]:
+        run_format: Dict[str, str] = dict()
         if self._start_time and self._start_datetime:
-            format_dict["timespec"] = datetime.strftime(
+            run_format["timespec"] = datetime.strftime(
                 self._start_datetime, "%Y%m%d_%H%M%S"
             )
         if self.run_id:
-            format_dict["run_id"] = self.run_id
-        format_dict["run_mode"] = "offline-run" if self._offline else "run"
+            run_format["run_id"] = self.run_id
+        run_format["run_mode"] = "offline-run" if self._offline else "run"
+        return run_format
+
+    def _path_convert(self, *path: Any) -> Optional[str]:
+        """convert slashes, expand ~ and other macros."""
+
+        format_dict: Dict[str, Union[str, int]] = dict(self._run_format_dict())
         format_dict["proc"] = os.getpid()
         # TODO(cling): hack to make sure we read from local settings
         #              this is wrong if the run_dir changes later
@@ -871,22 +909,39 @@ class Settings(object):
     def duplicate(self) -> "Settings":
         return copy.copy(self)
 
+    @classmethod
+    def _methods_with_prefix(cls, prefix: str) -> Dict[str, Callable[..., Any]]:
+        return {
+            k[len(prefix) :]: v
+            for k, v in vars(cls).items()
+            if k.startswith(prefix) and callable(v)
+        }
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _validators(cls) -> Dict[str, Callable[["Settings", Any], Optional[str]]]:
+        return cls._methods_with_prefix("_validate_")
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _preprocessors(cls) -> Dict[str, Callable[["Settings", Any], Any]]:
+        return cls._methods_with_prefix("_preprocess_")
+
     def _check_invalid(self, k: str, v: Any) -> None:
         if v is None:
             return
-        f = getattr(self, "_validate_" + k, None)
-        if not f or not callable(f):
+        f = self._validators().get(k)
+        if f is None:
             return
-        invalid = f(v)
+        invalid = f(self, v)
         if invalid:
             raise UsageError("Settings field `{}`: {}".format(k, invalid))
 
     def _perform_preprocess(self, k: str, v: Any) -> Optional[Any]:
-        f = getattr(self, "_preprocess_" + k, None)
-        if not f or not callable(f):
+        f = self._preprocessors().get(k)
+        if f is None:
             return v
-        else:
-            return f(v)
+        return f(self, v)
 
     def _update(
         self,
@@ -903,8 +958,15 @@ class Settings(object):
             for k in six.viewkeys(check):
                 if k not in self.__dict__:
                     raise KeyError(k)
-                v = self._perform_preprocess(k, check[k])
-                self._check_invalid(k, v)
+                v = check[k]
+                # None never overrides a setting, most constructor args are None
+                if v is None:
+                    continue
+                v = self._perform_preprocess(k, v)
+                # a value equal to the stored one has already been validated
+                current = self.__dict__[k]
+                if type(v) is not type(current) or v != current:
+                    self._check_invalid(k, v)
                 data[k] = v
         for k, v in six.iteritems(data):
             if v is None:
@@ -916,10 +978,8 @@ class Settings(object):
             self.__dict__[k] = v
             if _source:
                 self.__defaults_dict[k] = _source
-                self.__defaults_dict_set.setdefault(k, set()).add(_source)
             if _override:
                 self.__override_dict[k] = _override
-                self.__override_dict_set.setdefault(k, set()).add(_override)
 
     def update(self, __d: Dict = None, **kwargs: Any) -> None:
         _source = kwargs.pop("_source", None)
@@ -935,17 +995,15 @@ class Settings(object):
     def _priority_failed(
         self, k: str, source: Optional[int], override: Optional[int]
     ) -> bool:
+        if not source:
+            return False
         key_source: Optional[int] = self.__defaults_dict.get(k)
-        key_override: Optional[int] = self.__override_dict.get(k)
-        if not key_source or not source:
+        if not key_source:
             return False
-        if key_override and not override:
-            return True
-        if key_override and override and source > key_source:
-            return True
-        if not override and source < key_source:
-            return True
-        return False
+        key_override: Optional[int] = self.__override_dict.get(k)
+        if key_override:
+            return not override or source > key_source
+        return not override and source < key_source
 
     def _infer_settings_from_env(self) -> None:
         """Modify settings based on environment (for runs and cli)."""
@@ -1056,14 +1114,21 @@ class Settings(object):
         # having _apply_init() apply SOURCE.INIT to settings added via mutations
         # to settings object
         try:
-            self._update({name: value}, _source=self.Source.SETUP)
+            self._update({name: value}, _source=self._setup_source)
         except KeyError as e:
             raise AttributeError(str(e))
         object.__setattr__(self, name, value)
 
     @classmethod
-    def _property_keys(cls) -> Generator[str, None, None]:
-        return (k for k, v in vars(cls).items() if isinstance(v, property))
+    @functools.lru_cache(maxsize=None)
+    def _property_keys(cls) -> Tuple[str, ...]:
+        # properties are fixed at class definition, scan the class once
+        return tuple(k for k, v in vars(cls).items() if isinstance(v, property))
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _property_key_set(cls) -> FrozenSet[str]:
+        return frozenset(cls._property_keys())
 
     @classmethod
     def _class_keys(cls) -> Generator[str, None, None]:
@@ -1074,7 +1139,9 @@ class Settings(object):
         )
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def _get_class_defaults(cls) -> dict:
+        # shared across instances, callers must not mutate the result
         class_keys = set(cls._class_keys())
         return dict(
             (k, v) for k, v in vars(cls).items() if k in class_keys and v is not None
@@ -1087,8 +1154,7 @@ class Settings(object):
         return itertools.chain(self._public_keys(), self._property_keys())
 
     def __getitem__(self, k: str) -> Any:
-        props = self._property_keys()
-        if k in props:
+        if k in self._property_key_set():
             return getattr(self, k)
         return self.__dict__[k]
 